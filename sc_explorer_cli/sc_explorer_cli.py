@@ -12,8 +12,8 @@ from sc_tools.methods import (
     CardFileAttribute,
     list_cla_ins,
     list_p1_p2,
-    list_ef,
-    list_do,
+    iter_ef,
+    iter_do,
 )
 from sc_tools.readers import (
     list_contact_reader,
@@ -266,16 +266,18 @@ class ScExplorerCli:
 
         return self
 
-    def select_ef(self, ef_id, cla=0x00) -> Self:
+    def select_ef(self, ef_id, cla=0x00, fcp=False) -> Self:
         """SELECT FILE (EF)
 
         Args:
             ef_id (bytes): EF identifier as hex string
             cla (int, optional): CLA. Defaults to 0x00.
+            fcp (bool, optional): Get File Control Parameters
 
         Raises:
             ValueError: Invalid arguemnt `ef_id`
             ValueError: Invalid arguemnt `cla`
+            ValueError: Invalid arguemnt `fcp`
 
         Returns:
             Self: This instance
@@ -285,11 +287,13 @@ class ScExplorerCli:
             raise ValueError("Argument `ef_id` must be str.")
         if not isinstance(cla, int):
             raise ValueError("Argument `cla` must be int.")
+        if not isinstance(fcp, bool):
+            raise ValueError("Argument `fcp` must be bool.")
 
         ef_id = ef_id.replace(" ", "")
         ef_id_bytes = bytes.fromhex(ef_id)
         self.last_response_status, self.last_response_data = (
-            self.__connection.select_ef(ef_id_bytes, cla=cla)
+            self.__connection.select_ef(ef_id_bytes, cla=cla, fcp=fcp)
         )
 
         self.selected_ef = ef_id_bytes
@@ -379,7 +383,14 @@ class ScExplorerCli:
         return self
 
     def list_cla_ins(
-        self, cla_start=0x00, cla_end=0x100, ins_start=0x00, ins_end=0x100
+        self,
+        cla_start=0x00,
+        cla_end=0x100,
+        ins_start=0x00,
+        ins_end=0x100,
+        concurrency=1,
+        mode="full",
+        prune_cla_prefix=True,
     ) -> Self:
         """List valid CLA-INS
 
@@ -388,12 +399,18 @@ class ScExplorerCli:
             cla_end (int, optional): CLA end. Defaults to 0x100.
             ins_start (int, optional): INS start. Defaults to 0x00.
             ins_end (int, optional): INS end. Defaults to 0x100.
+            concurrency (int, optional): Maximum APDUs queued. Transmission to the card is serialized. Defaults to 1.
+            mode (str, optional): Scan mode. Defaults to "full". {full|adaptive}
+            prune_cla_prefix (bool, optional): Skip CLA families whose variants x0, x4, x8 and xC are not provided. Defaults to True.
 
         Raises:
             ValueError: Invalid arguemnt `cla_start`
             ValueError: Invalid arguemnt `cla_end`
             ValueError: Invalid arguemnt `ins_start`
             ValueError: Invalid arguemnt `ins_end`
+            ValueError: Invalid arguemnt `concurrency`
+            ValueError: Invalid arguemnt `mode`
+            ValueError: Invalid arguemnt `prune_cla_prefix`
 
         Returns:
             Self: This instance
@@ -407,15 +424,37 @@ class ScExplorerCli:
             raise ValueError("Argument `ins_start` must be int.")
         if not isinstance(ins_end, int):
             raise ValueError("Argument `ins_end` must be int.")
+        if not isinstance(concurrency, int):
+            raise ValueError("Argument `concurrency` must be int.")
+        if not isinstance(mode, str):
+            raise ValueError("Argument `mode` must be str.")
+        if not isinstance(prune_cla_prefix, bool):
+            raise ValueError("Argument `prune_cla_prefix` must be bool.")
 
         cla_ins_list = list_cla_ins(
-            self.__connection, cla_start, cla_end, ins_start, ins_end
+            self.__connection,
+            cla_start,
+            cla_end,
+            ins_start,
+            ins_end,
+            concurrency=concurrency,
+            mode=mode,
+            prune_cla_prefix=prune_cla_prefix,
         )
 
         return self
 
     def list_p1_p2(
-        self, cla, ins, p1_start=0x00, p1_end=0x100, p2_start=0x00, p2_end=0x100
+        self,
+        cla,
+        ins,
+        p1_start=0x00,
+        p1_end=0x100,
+        p2_start=0x00,
+        p2_end=0x100,
+        concurrency=1,
+        mode="full",
+        always_probe_le_max=False,
     ) -> Self:
         """List valid P1-P2
 
@@ -426,6 +465,9 @@ class ScExplorerCli:
             p1_end (int, optional): P1 end. Defaults to 0x100.
             p2_start (int, optional): P2 start. Defaults to 0x00.
             p2_end (int, optional): P2 end. Defaults to 0x100.
+            concurrency (int, optional): Maximum APDUs queued. Transmission to the card is serialized. Defaults to 1.
+            mode (str, optional): Scan mode. Defaults to "full". {full|adaptive}
+            always_probe_le_max (bool, optional): Retry rejected P1-P2 with Le=MAX even if the CLA-INS rejects Le=MAX. Defaults to False.
 
         Raises:
             ValueError: Invalid argument `cla`
@@ -434,6 +476,9 @@ class ScExplorerCli:
             ValueError: Invalid argument `p1_end`
             ValueError: Invalid argument `p2_start`
             ValueError: Invalid argument `p2_end`
+            ValueError: Invalid argument `concurrency`
+            ValueError: Invalid argument `mode`
+            ValueError: Invalid argument `always_probe_le_max`
 
         Returns:
             Self: This instance
@@ -451,9 +496,24 @@ class ScExplorerCli:
             raise ValueError("Argument `p2_start` must be int.")
         if not isinstance(p2_end, int):
             raise ValueError("Argument `p2_end` must be int.")
+        if not isinstance(concurrency, int):
+            raise ValueError("Argument `concurrency` must be int.")
+        if not isinstance(mode, str):
+            raise ValueError("Argument `mode` must be str.")
+        if not isinstance(always_probe_le_max, bool):
+            raise ValueError("Argument `always_probe_le_max` must be bool.")
 
         p1_p2_list = list_p1_p2(
-            self.__connection, cla, ins, p1_start, p1_end, p2_start, p2_end
+            self.__connection,
+            cla,
+            ins,
+            p1_start,
+            p1_end,
+            p2_start,
+            p2_end,
+            concurrency=concurrency,
+            mode=mode,
+            always_probe_le_max=always_probe_le_max,
         )
 
         return self
@@ -464,6 +524,8 @@ class ScExplorerCli:
         start=0x0000,
         end=0x10000,
         dump_path=None,
+        concurrency=1,
+        use_cache=True,
     ) -> Self:
         """List EF
 
@@ -472,12 +534,16 @@ class ScExplorerCli:
             start (int, optional): DF identifier start. Defaults to 0x0000.
             end (int, optional): DF identifier end. Defaults to 0x10000.
             dump_path (str | None, optional): Set directory path to dump response data to file. Defaults to None.
+            concurrency (int, optional): Maximum SELECT FILE queued. Transmission to the card is serialized. Defaults to 1.
+            use_cache (bool, optional): Use cached EF Attribute if any. Defaults to True.
 
         Raises:
             ValueError: Invalid argument `cla`
             ValueError: Invalid argument `start`
             ValueError: Invalid argument `end`
             ValueError: Invalid argument `dump_path`
+            ValueError: Invalid argument `concurrency`
+            ValueError: Invalid argument `use_cache`
 
         Returns:
             Self: This instance
@@ -491,6 +557,10 @@ class ScExplorerCli:
             raise ValueError("Argument `end` must be int.")
         if dump_path is not None and not isinstance(dump_path, str):
             raise ValueError("Argument `dump_path` must be str.")
+        if not isinstance(concurrency, int):
+            raise ValueError("Argument `concurrency` must be int.")
+        if not isinstance(use_cache, bool):
+            raise ValueError("Argument `use_cache` must be bool.")
 
         def found_callback(ef_id: bytes, ef_attribute: CardFileAttribute) -> None:
             if dump_path is None:
@@ -523,13 +593,17 @@ class ScExplorerCli:
             with open(file_path, "wb") as file:
                 file.write(data)
 
-        ef_list = list_ef(
+        # Found EFs are handled by the callback, so do not keep them
+        for ef in iter_ef(
             self.__connection,
             cla=cla,
             start=start,
             end=end,
             found_callback=found_callback,
-        )
+            concurrency=concurrency,
+            use_cache=use_cache,
+        ):
+            pass
 
         return self
 
@@ -537,22 +611,27 @@ class ScExplorerCli:
         self,
         cla=0x00,
         dump_path=None,
+        concurrency=1,
     ) -> Self:
         """List Data Object
 
         Args:
             cla (hexadecimal, optional): _description_. Defaults to 0x00.
             dump_path (str | None, optional): Set path to dump response data to file. Defaults to None.
+            concurrency (int, optional): Maximum APDUs queued. Transmission to the card is serialized. Defaults to 1.
 
         Raises:
             ValueError: Invalid argument `cla`
             ValueError: Invalid argument `dump_path`
+            ValueError: Invalid argument `concurrency`
         """
 
         if not isinstance(cla, int):
             raise ValueError("Argument `cla` must be int.")
         if dump_path is not None and not isinstance(dump_path, str):
             raise ValueError("Argument `dump_path` must be str.")
+        if not isinstance(concurrency, int):
+            raise ValueError("Argument `concurrency` must be int.")
 
         def found_callback(tag: bytes, simplified_encoding: bool, data: bytes) -> None:
             if dump_path is None:
@@ -573,7 +652,14 @@ class ScExplorerCli:
             with open(file_path, "wb") as file:
                 file.write(data)
 
-        do_list = list_do(self.__connection, cla=cla, found_callback=found_callback)
+        # Found Data Objects are handled by the callback, so do not keep them
+        for do in iter_do(
+            self.__connection,
+            cla=cla,
+            found_callback=found_callback,
+            concurrency=concurrency,
+        ):
+            pass
 
         return self
 
@@ -2,6 +2,7 @@
 
 import logging
 from nfc.tag.tt4 import Type4Tag
+from threading import Lock
 from smartcard.CardConnection import CardConnection as PyscardCardConnection
 from typing import Callable
 
@@ -17,6 +18,8 @@ class CardConnection:
         transmit: Callable[[bytes], tuple[CardResponseStatus, bytes]],
         allow_extended_apdu=True,
         identifier: bytes | None = None,
+        atr: bytes | None = None,
+        thread_safe: bool = False,
     ) -> None:
         """Constructor
 
@@ -24,19 +27,50 @@ class CardConnection:
             transmit (Callable[[bytes], tuple[CardResponseStatus, bytes]]): Transmit function
             allow_extended_apdu (bool, optional): Allow Extended APDU. Defaults to True.
             identifier (bytes | None, optional): Identifier for NFC. Defaults to None.
+            atr (bytes | None, optional): ATR for PC/SC. Defaults to None.
+            thread_safe (bool, optional): `transmit` can be called from multiple threads at once. If False, calls are serialized. Defaults to False.
         """
 
         self.__logger = logging.getLogger(__name__)
 
         self.__transmit = transmit
+        self.__transmit_lock = None if thread_safe else Lock()
         self.allow_extended_apdu = allow_extended_apdu
         self.identifier = identifier
+        self.atr = atr
+        self.selected_df: bytes | None = None
+        # CLA-INS pairs the card rejected as not provided in the selected DF
+        self.unsupported_cla_ins: set[tuple[int, int]] = set()
+        # Whether SELECT FILE (EF) returning FCP was rejected in the selected DF
+        self.select_fcp_unsupported = False
+        # EF Attribute values by CLA and EF identifier in the selected DF
+        self.attribute_ef_cache: dict[tuple[int, bytes], int] = {}
+        # Whether a command which may change the security state was sent
+        self.security_state_changed = False
+
+    def invalidate_cache(self, security_state_changed: bool = True) -> None:
+        """Invalidate results cached for the selected DF and security state
+
+        Called before commands which may change them.
+
+        Args:
+            security_state_changed (bool, optional): The security state may change. Defaults to True.
+        """
+
+        self.attribute_ef_cache.clear()
+        # Provided instructions depend on the selected application
+        self.unsupported_cla_ins.clear()
+        self.select_fcp_unsupported = False
+        if security_state_changed:
+            self.security_state_changed = True
 
     def transmit(
         self, command: bytes, raise_error: bool = True
     ) -> tuple[CardResponseStatus, bytes]:
         """Transmit
 
+        Any command may change the selected DF or the security state, so cached results are invalidated.
+
         Args:
             command (bytes): Command
             raise_error (bool, optional): Raise error when card error response returned. Defaults to True.
@@ -48,20 +82,50 @@ class CardConnection:
             tuple[CardResponseStatus, bytes]: Response Status and Data
         """
 
-        command_hex = command.hex(" ").upper()
-        self.__logger.debug(f"SC <- {command_hex}")
+        self.invalidate_cache()
+        return self.__send(command, raise_error)
+
+    def __send(
+        self, command: bytes, raise_error: bool
+    ) -> tuple[CardResponseStatus, bytes]:
+        """Transmit without invalidating cached results
+
+        Args:
+            command (bytes): Command
+            raise_error (bool): Raise error when card error response returned
+
+        Raises:
+            CardResponseError: Card returned error response
+
+        Returns:
+            tuple[CardResponseStatus, bytes]: Response Status and Data
+        """
+
+        # Skip formatting on the hot path of scans unless it will be logged
+        debug = self.__logger.isEnabledFor(logging.DEBUG)
 
-        status, data = self.__transmit(command)
-        status_type = status.status_type()
+        if debug:
+            command_hex = command.hex(" ").upper()
+            self.__logger.debug(f"SC <- {command_hex}")
 
-        sw_hex = format(status.sw, "04X")
-        if len(data) != 0:
-            data_hex = data.hex(" ").upper()
-            self.__logger.debug(f"SC -> {data_hex} - SW: {sw_hex} ({status_type.name})")
+        if self.__transmit_lock is None:
+            status, data = self.__transmit(command)
         else:
-            self.__logger.debug(f"SC -> SW: {sw_hex} ({status_type.name})")
+            with self.__transmit_lock:
+                status, data = self.__transmit(command)
+
+        if debug:
+            status_type = status.status_type()
+            sw_hex = format(status.sw, "04X")
+            if len(data) != 0:
+                data_hex = data.hex(" ").upper()
+                self.__logger.debug(
+                    f"SC -> {data_hex} - SW: {sw_hex} ({status_type.name})"
+                )
+            else:
+                self.__logger.debug(f"SC -> SW: {sw_hex} ({status_type.name})")
 
-        if raise_error and status_type != CardResponseStatusType.NORMAL_END:
+        if raise_error and status.status_type() != CardResponseStatusType.NORMAL_END:
             raise CardResponseError(status)
         return status, data
 
@@ -106,7 +170,7 @@ class CardConnection:
             le=limit,
             extended=self.allow_extended_apdu,
         )
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        return self.__send(command.to_bytes(), raise_error)
 
     def read_all_binary(
         self,
@@ -184,7 +248,7 @@ class CardConnection:
             le=limit,
             extended=self.allow_extended_apdu,
         )
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        return self.__send(command.to_bytes(), raise_error)
 
     def select_df(
         self,
@@ -215,13 +279,21 @@ class CardConnection:
         if fci:
             command.p2 = 0x00
             command.le = "max"
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        self.invalidate_cache(security_state_changed=False)
+        status, data = self.__send(command.to_bytes(), raise_error)
+        if status.status_type() in (
+            CardResponseStatusType.NORMAL_END,
+            CardResponseStatusType.NORMAL_END_WITH_REMAINING_DATA_LENGTH,
+        ):
+            self.selected_df = df_id
+        return status, data
 
     def select_ef(
         self,
         ef_id: bytes,
         cla: int = 0x00,
         raise_error: bool = True,
+        fcp: bool = False,
     ) -> tuple[CardResponseStatus, bytes]:
         """SELECT FILE (EF)
 
@@ -229,6 +301,7 @@ class CardConnection:
             ef_id (bytes): EF Identifier
             cla (int, optional): CLA. Defaults to 0x00.
             raise_error (bool, optional): Raise error when card error response returned. Defaults to True.
+            fcp (bool, optional): Get File Control Parameters. Defaults to False.
 
         Raises:
             ValueError: Invalid argument `cla`
@@ -244,7 +317,10 @@ class CardConnection:
             raise ValueError("Argument `ef_id` length must be 2.")
 
         command = CommandApdu(cla, 0xA4, 0x02, 0x0C, data=ef_id, extended=False)
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        if fcp:
+            command.p2 = 0x04
+            command.le = "max"
+        return self.__send(command.to_bytes(), raise_error)
 
     def verify(
         self,
@@ -270,7 +346,10 @@ class CardConnection:
             raise ValueError("Argument `cla` out of range. (0x00 <= cla <= 0xFF)")
 
         command = CommandApdu(cla, 0x20, 0x00, 0x80, data=key, extended=False)
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        # Without key, VERIFY only gets the verification status
+        if key is not None:
+            self.invalidate_cache()
+        return self.__send(command.to_bytes(), raise_error)
 
     def internal_authenticate(
         self,
@@ -300,7 +379,7 @@ class CardConnection:
         command = CommandApdu(
             cla, 0x88, 0x00, 0x80, data=challenge, le=response_length, extended=False
         )
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        return self.__send(command.to_bytes(), raise_error)
 
     def external_authenticate(
         self,
@@ -328,7 +407,10 @@ class CardConnection:
         command = CommandApdu(
             cla, 0x82, 0x00, 0x80, data=authenticate_code, extended=False
         )
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        # Without authenticate code, EXTERNAL AUTHENTICATE only gets the status
+        if authenticate_code is not None:
+            self.invalidate_cache()
+        return self.__send(command.to_bytes(), raise_error)
 
     def get_data(
         self,
@@ -408,7 +490,7 @@ class CardConnection:
                     le="max",
                     extended=self.allow_extended_apdu,
                 )
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        return self.__send(command.to_bytes(), raise_error)
 
     def jpki_sign(
         self,
@@ -428,7 +510,7 @@ class CardConnection:
         command = CommandApdu(
             0x80, 0x2A, 0x00, 0x80, data=input, le="max", extended=False
         )
-        return self.transmit(command.to_bytes(), raise_error=raise_error)
+        return self.__send(command.to_bytes(), raise_error)
 
 
 def create_card_connection(
@@ -455,7 +537,13 @@ def create_card_connection(
             response_status = CardResponseStatus(sw)
             return response_status, bytes(data)
 
-        return CardConnection(transmit, allow_extended_apdu=allow_extended_apdu)
+        return CardConnection(
+            transmit,
+            allow_extended_apdu=allow_extended_apdu,
+            atr=bytes(connection.getATR()),
+            # Concurrent SCardTransmit on one handle is not safe on every PC/SC stack
+            thread_safe=False,
+        )
 
     elif isinstance(connection, Type4Tag):
 
@@ -471,4 +559,6 @@ def create_card_connection(
             transmit,
             allow_extended_apdu=allow_extended_apdu,
             identifier=connection.identifier,
+            # nfcpy keeps ISO-DEP block number state in `transceive`
+            thread_safe=False,
         )
@@ -1,6 +1,7 @@
 """Card Response"""
 
 from enum import Enum, unique
+from functools import cache
 from typing import Self
 
 
@@ -50,9 +51,12 @@ class CardResponseStatusType(Enum):
     NORMAL_END = 0x9000
 
     @classmethod
+    @cache
     def from_sw(cls, sw: int) -> Self:
         """From SW
 
+        Results are memoized per SW, as SW has only 0x10000 possible values.
+
         Args:
             sw (int): SW
 
@@ -1,15 +1,43 @@
 """Usable methods for Smart Cards"""
 
-from enum import Flag
+import inspect
+import os
+import shelve
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from enum import Flag, IntFlag
+from functools import wraps
+from itertools import islice
+from queue import Queue
+from threading import Event, Lock, Timer
 from tqdm import tqdm
-from typing import Callable
+from typing import Any, Callable, Iterable, Iterator, Literal, ParamSpec, Self, TypeVar
 
 from .apdu import CommandApdu
-from .card_response import CardResponseStatusType, CardResponseError
+from .card_response import CardResponseStatus, CardResponseStatusType, CardResponseError
 from .card_connection import CardConnection
 
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+_P = ParamSpec("_P")
+
+ScanMode = Literal["full", "adaptive"]
+
+# Progress bar throttling for loops with one iteration per probe
+_PROGRESS_MININTERVAL = 0.2
+_PROGRESS_MINITERS = 64
+
+# Set to a directory path to persist `attribute_ef` results across runs
+CACHE_DIR_ENV = "SC_TOOLS_CACHE_DIR"
+
+
+class CardFileAttribute(IntFlag):
+    # Keep str() and format() of Flag, which IntFlag changed to the int value
+    __str__ = Flag.__str__
+    __format__ = Flag.__format__
 
-class CardFileAttribute(Flag):
     UNKNOWN = 0x00000000
     WEF_TRANSPARENT = 0x00000001
     WEF_RECORD = 0x00000002
@@ -22,12 +50,454 @@ class CardFileAttribute(Flag):
     JPKI_SIGN_PRIVATE_KEY = 0x00001000
 
 
+# DigestInfo of SHA-256("") (RFC 8017 Section 9.2), signed to probe JPKI private keys.
+# Kept as sent historically: the AlgorithmIdentifier length is 0x0B, where DER gives 0x0D.
+_JPKI_EMPTY_SHA256_DIGEST_INFO = bytes.fromhex(
+    "3031300B0609608648016503040201050004"
+    "20e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+)
+
+# Status types meaning the INS is not usable with the CLA
+_CLA_INS_SKIP_STATUS_TYPES = frozenset(
+    {
+        CardResponseStatusType.INS_NOT_PROVIDED,
+        CardResponseStatusType.ACCESS_FEATURE_WITH_THE_SPECIFIED_LOGICAL_CHANNEL_NUMBER_NOT_PROVIDED,
+        CardResponseStatusType.SECURE_MESSAGING_FEATURE_NOT_PROVIDED,
+    }
+)
+# Status types meaning the CLA-INS is not provided by the card at all
+_NOT_PROVIDED_STATUS_TYPES = frozenset(
+    {
+        CardResponseStatusType.CLASS_NOT_PROVIDED,
+        CardResponseStatusType.INS_NOT_PROVIDED,
+    }
+)
+# Status types meaning the EF exists
+_EF_FOUND_STATUS_TYPES = frozenset(
+    {
+        CardResponseStatusType.NORMAL_END,
+        CardResponseStatusType.FILE_CONTROL_INFORMATION_FAILURE,
+    }
+)
+# Status types meaning the CLA-INS does not accept Le=MAX
+_LE_MAX_REJECTED_STATUS_TYPES = frozenset(
+    {
+        CardResponseStatusType.INS_NOT_PROVIDED,
+        CardResponseStatusType.INCORRECT_LC_LE_FIELD,
+    }
+)
+# Status types meaning SELECT FILE (EF) returning FCP is not supported
+_SELECT_FCP_REJECTED_STATUS_TYPES = frozenset(
+    {
+        CardResponseStatusType.INCORRECT_LC_LE_FIELD,
+        CardResponseStatusType.FEATURE_NOT_PROVIDED,
+        CardResponseStatusType.INCORRECT_P1_P2_VALUE,
+        CardResponseStatusType.INS_NOT_PROVIDED,
+    }
+)
+# Status types meaning the Data Object exists
+_DO_FOUND_STATUS_TYPES = frozenset(
+    {
+        CardResponseStatusType.NORMAL_END,
+        CardResponseStatusType.INCORRECT_LC_LE_FIELD,
+    }
+)
+
+
+class _BufferedWriter:
+    """Buffer messages for `tqdm.write` and write them in bursts"""
+
+    def __init__(self, interval: float = 0.1, max_lines: int = 64) -> None:
+        """Constructor
+
+        Args:
+            interval (float, optional): Maximum seconds a message stays buffered. Defaults to 0.1.
+            max_lines (int, optional): Maximum buffered messages. Defaults to 64.
+        """
+
+        self.__interval = interval
+        self.__max_lines = max_lines
+        self.__lines: list[str] = []
+        self.__lock = Lock()
+        self.__timer: Timer | None = None
+        self.__last_flush = time.monotonic()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.flush()
+
+    def write(self, line: str) -> None:
+        """Write message
+
+        Args:
+            line (str): Message
+        """
+
+        with self.__lock:
+            self.__lines.append(line)
+            if (
+                len(self.__lines) < self.__max_lines
+                and time.monotonic() - self.__last_flush < self.__interval
+            ):
+                # Make sure a trailing message is not held until the scan ends
+                if self.__timer is None:
+                    self.__timer = Timer(self.__interval, self.flush)
+                    self.__timer.daemon = True
+                    self.__timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write buffered messages"""
+
+        with self.__lock:
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+            if len(self.__lines) != 0:
+                tqdm.write("\n".join(self.__lines))
+                self.__lines.clear()
+            self.__last_flush = time.monotonic()
+
+
+def _pipelined_map(
+    function: Callable[[_T], _R],
+    iterable: Iterable[_T],
+    concurrency: int = 1,
+) -> Iterator[_R]:
+    """Map lazily with up to `concurrency` calls in flight, yielding results in order
+
+    Args:
+        function (Callable[[_T], _R]): Function
+        iterable (Iterable[_T]): Arguments
+        concurrency (int, optional): Maximum calls in flight. Defaults to 1.
+
+    Yields:
+        _R: Result of `function`
+    """
+
+    if concurrency <= 1:
+        for item in iterable:
+            yield function(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending: deque[Future[_R]] = deque()
+        try:
+            for item in iterable:
+                pending.append(executor.submit(function, item))
+                if len(pending) >= concurrency:
+                    yield pending.popleft().result()
+            while len(pending) != 0:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _probe_cla_ins(
+    connection: CardConnection, ins: int, command: bytes
+) -> tuple[int, CardResponseStatus]:
+    """Probe CLA-INS
+
+    Args:
+        connection (CardConnection): Card Connection
+        ins (int): INS
+        command (bytes): Command APDU without Le
+
+    Returns:
+        tuple[int, CardResponseStatus]: INS and Response Status
+    """
+
+    status, data = connection.transmit(command, raise_error=False)
+    return ins, status
+
+
+def _probe_p1_p2(
+    connection: CardConnection, p2: int, command: bytes, le_max_field: bytes | None
+) -> tuple[int, CardResponseStatus, bool]:
+    """Probe P1-P2 without Le, then with Le=MAX if P1-P2 was rejected
+
+    Args:
+        connection (CardConnection): Card Connection
+        p2 (int): P2
+        command (bytes): Command APDU without Le
+        le_max_field (bytes | None): Le field for Le=MAX. None to skip the Le=MAX retry.
+
+    Returns:
+        tuple[int, CardResponseStatus, bool]: P2, Response Status and whether Le=MAX was sent
+    """
+
+    # No Le
+    status, data = connection.transmit(command, raise_error=False)
+    if (
+        le_max_field is None
+        or status.status_type() != CardResponseStatusType.INCORRECT_P1_P2_VALUE
+    ):
+        return p2, status, False
+    # Le=MAX
+    status, data = connection.transmit(command + le_max_field, raise_error=False)
+    return p2, status, True
+
+
+def _probe_do(
+    connection: CardConnection, tag: bytes, simplified_encoding: bool, cla: int
+) -> tuple[bytes, CardResponseStatus, bytes]:
+    """Probe Data Object
+
+    Args:
+        connection (CardConnection): Card Connection
+        tag (bytes): Tag
+        simplified_encoding (bool): Simplified encoding
+        cla (int): CLA
+
+    Returns:
+        tuple[bytes, CardResponseStatus, bytes]: Tag, Response Status and Data
+    """
+
+    status, data = connection.get_data(
+        tag, simplified_encoding=simplified_encoding, cla=cla, raise_error=False
+    )
+    return tag, status, data
+
+
+def _adaptive_rows(
+    is_skipped: Callable[[int], bool], start: int, end: int
+) -> Iterator[int]:
+    """Bisect [start, end) and yield rows which may have hits
+
+    A range is dropped when its first, middle and last rows are all skipped.
+    Ranges are halved, so sampled rows fall on power-of-two boundaries such as CLA 0x80.
+
+    Args:
+        is_skipped (Callable[[int], bool]): Probe whether a row is skipped
+        start (int): Start row
+        end (int): End row
+
+    Yields:
+        int: Row not proven to be skipped
+    """
+
+    skipped: dict[int, bool] = {}
+
+    def probe(row: int) -> bool:
+        if row not in skipped:
+            skipped[row] = is_skipped(row)
+        return skipped[row]
+
+    def bisect(start: int, end: int) -> Iterator[int]:
+        if end - start <= 3:
+            yield from (row for row in range(start, end) if not probe(row))
+            return
+        middle = (start + end) // 2
+        if probe(start) and probe(middle) and probe(end - 1):
+            return
+        yield from bisect(start, middle)
+        yield from bisect(middle, end)
+
+    yield from bisect(start, end)
+
+
+def _validate_scan_options(arguments: dict[str, Any]) -> None:
+    """Validate `concurrency` and, if any, `mode` and `connections` arguments of a scanner
+
+    Args:
+        arguments (dict[str, Any]): Arguments by name
+
+    Raises:
+        ValueError: Invalid argument `concurrency`
+        ValueError: Invalid argument `mode`
+        ValueError: Invalid argument `connections`
+    """
+
+    if arguments["concurrency"] < 1:
+        raise ValueError("Argument `concurrency` must be greater than or equal 1.")
+    if "mode" in arguments and arguments["mode"] not in ("full", "adaptive"):
+        raise ValueError('Argument `mode` must be "full" or "adaptive".')
+    connections = arguments.get("connections")
+    if connections is not None and len(connections) == 0:
+        raise ValueError("Argument `connections` must not be empty.")
+
+
+def _validate_ranges(
+    validate: Callable[[dict[str, Any]], None] | None = None,
+    **ranges: tuple[int, int],
+) -> Callable[[Callable[_P, _R]], Callable[_P, _R]]:
+    """Decorator to validate arguments on call
+
+    Also validates arguments of generator functions before the first item is requested.
+
+    Args:
+        validate (Callable[[dict[str, Any]], None] | None, optional): Validator of the other arguments by name, called after the range checks. Defaults to None.
+        **ranges (tuple[int, int]): Inclusive minimum and maximum of int arguments by name
+
+    Returns:
+        Callable[[Callable[_P, _R]], Callable[_P, _R]]: Decorator
+    """
+
+    def decorator(function: Callable[_P, _R]) -> Callable[_P, _R]:
+        signature = inspect.signature(function)
+        checks: list[tuple[str, int, int, str]] = []
+        for name, (minimum, maximum) in ranges.items():
+            width = max(len(format(maximum - 1, "X")), 2)
+            minimum_hex = format(minimum, f"0{width}X")
+            maximum_hex = format(maximum, "02X")
+            checks.append(
+                (
+                    name,
+                    minimum,
+                    maximum,
+                    f"Argument `{name}` out of range. (0x{minimum_hex} <= {name} <= 0x{maximum_hex})",
+                )
+            )
+
+        @wraps(function)
+        def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _R:
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            for name, minimum, maximum, message in checks:
+                value = arguments.arguments[name]
+                if value < minimum or maximum < value:
+                    raise ValueError(message)
+            if validate is not None:
+                validate(arguments.arguments)
+            return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@_validate_ranges(
+    validate=_validate_scan_options,
+    cla_start=(0x00, 0x100),
+    cla_end=(0x00, 0x100),
+    ins_start=(0x00, 0x100),
+    ins_end=(0x00, 0x100),
+)
+def iter_cla_ins(
+    connection: CardConnection,
+    cla_start: int = 0x00,
+    cla_end: int = 0x100,
+    ins_start: int = 0x00,
+    ins_end: int = 0x100,
+    concurrency: int = 1,
+    mode: ScanMode = "full",
+    prune_cla_prefix: bool = True,
+) -> Iterator[tuple[int, int, CardResponseStatusType]]:
+    """Iterate valid CLA-INS
+
+    Args:
+        connection (CardConnection): Card Connection
+        cla_start (int, optional): CLA start. Defaults to 0x00.
+        cla_end (int, optional): CLA end. Defaults to 0x100.
+        ins_start (int, optional): INS start. Defaults to 0x00.
+        ins_end (int, optional): INS end. Defaults to 0x100.
+        concurrency (int, optional): Maximum APDUs in flight. APDUs only overlap on a CardConnection created with `thread_safe=True`. Defaults to 1.
+        mode (ScanMode, optional): "full" probes every CLA. "adaptive" bisects the CLA range and drops sub-ranges whose sampled CLAs belong to CLA families (high nibbles) with x0, x4, x8 and xC all not provided. Defaults to "full".
+        prune_cla_prefix (bool, optional): Skip a CLA high nibble (class family) when its variants x0, x4, x8 and xC in range are all not provided at `ins_start`. Disable for exhaustive audits. Defaults to True.
+
+    Raises:
+        ValueError: Invalid argument `cla_start`
+        ValueError: Invalid argument `cla_end`
+        ValueError: Invalid argument `ins_start`
+        ValueError: Invalid argument `ins_end`
+        ValueError: Invalid argument `concurrency`
+        ValueError: Invalid argument `mode`
+
+    Yields:
+        tuple[int, int, CardResponseStatusType]: Valid CLA-INS and Response Status
+    """
+
+    class_not_provided = CardResponseStatusType.CLASS_NOT_PROVIDED
+    skip_status_types = _CLA_INS_SKIP_STATUS_TYPES
+
+    # Only mutated here, so workers receive immutable bytes
+    command = CommandApdu(
+        0x00, 0x00, 0x00, 0x00, extended=connection.allow_extended_apdu
+    )
+
+    def commands(cla: int) -> Iterator[tuple[int, bytes]]:
+        for ins in range(ins_start, ins_end):
+            command.cla, command.ins = cla, ins
+            yield ins, command.to_bytes()
+
+    # Whether the CLA is not provided at `ins_start`, by CLA
+    class_rejected: dict[int, bool] = {}
+
+    def is_class_not_provided(cla: int) -> bool:
+        if cla not in class_rejected:
+            command.cla, command.ins = cla, ins_start
+            ins, status = _probe_cla_ins(connection, ins_start, command.to_bytes())
+            class_rejected[cla] = status.status_type() == class_not_provided
+        return class_rejected[cla]
+
+    def is_family_not_provided(prefix: int) -> bool:
+        # The low nibble holds secure messaging and logical channel bits, so sample across them
+        variants = [
+            prefix << 4 | low
+            for low in (0x0, 0x4, 0x8, 0xC)
+            if cla_start <= prefix << 4 | low < cla_end
+        ]
+        return len(variants) != 0 and all(
+            is_class_not_provided(variant) for variant in variants
+        )
+
+    if mode == "adaptive" and ins_start < ins_end:
+        # A single CLA says nothing about its secure messaging and logical channel variants
+        clas = _adaptive_rows(
+            lambda cla: is_family_not_provided(cla >> 4), cla_start, cla_end
+        )
+    else:
+        clas = range(cla_start, cla_end)
+
+    # Whether the CLA high nibble (class family) is not provided, by high nibble
+    family_rejected: dict[int, bool] = {}
+    prune_cla_prefix = prune_cla_prefix and ins_start < ins_end
+
+    with _BufferedWriter() as writer:
+        for cla in tqdm(clas, desc="List valid CLA-INS"):
+            if prune_cla_prefix:
+                prefix = cla >> 4
+                if prefix not in family_rejected:
+                    family_rejected[prefix] = is_family_not_provided(prefix)
+                if family_rejected[prefix]:
+                    continue
+            # Already rejected at `ins_start`, so the row has no hits
+            if class_rejected.get(cla, False):
+                continue
+            responses = _pipelined_map(
+                lambda item: _probe_cla_ins(connection, *item),
+                commands(cla),
+                concurrency,
+            )
+            with closing(responses):
+                for ins, status in responses:
+                    status_type = status.status_type()
+                    if status_type == class_not_provided:
+                        break
+                    if status_type in skip_status_types:
+                        continue
+                    cla_hex = format(cla, "02X")
+                    ins_hex = format(ins, "02X")
+                    sw_hex = format(status.sw, "04X")
+                    writer.write(
+                        f"CLA {cla_hex}, INS {ins_hex} found with status {sw_hex} ({status_type})."
+                    )
+                    yield cla, ins, status
+
+
 def list_cla_ins(
     connection: CardConnection,
     cla_start: int = 0x00,
     cla_end: int = 0x100,
     ins_start: int = 0x00,
     ins_end: int = 0x100,
+    concurrency: int = 1,
+    mode: ScanMode = "full",
+    prune_cla_prefix: bool = True,
 ) -> list[tuple[int, int, CardResponseStatusType]]:
     """List valid CLA-INS
 
@@ -37,56 +507,143 @@ def list_cla_ins(
         cla_end (int, optional): CLA end. Defaults to 0x100.
         ins_start (int, optional): INS start. Defaults to 0x00.
         ins_end (int, optional): INS end. Defaults to 0x100.
+        concurrency (int, optional): Maximum APDUs in flight. APDUs only overlap on a CardConnection created with `thread_safe=True`. Defaults to 1.
+        mode (ScanMode, optional): "full" probes every CLA. "adaptive" bisects the CLA range and drops sub-ranges whose sampled CLAs belong to CLA families (high nibbles) with x0, x4, x8 and xC all not provided. Defaults to "full".
+        prune_cla_prefix (bool, optional): Skip a CLA high nibble (class family) when its variants x0, x4, x8 and xC in range are all not provided at `ins_start`. Disable for exhaustive audits. Defaults to True.
 
     Raises:
         ValueError: Invalid argument `cla_start`
         ValueError: Invalid argument `cla_end`
         ValueError: Invalid argument `ins_start`
         ValueError: Invalid argument `ins_end`
+        ValueError: Invalid argument `concurrency`
+        ValueError: Invalid argument `mode`
 
     Returns:
         list[tuple[int, int, CardResponseStatusType]]: List of valid CLA-INS and Response Status
     """
 
-    if cla_start < 0x00 or 0x100 < cla_start:
-        raise ValueError(
-            "Argument `cla_start` out of range. (0x00 <= cla_start <= 0x100)"
+    return list(
+        iter_cla_ins(
+            connection,
+            cla_start,
+            cla_end,
+            ins_start,
+            ins_end,
+            concurrency=concurrency,
+            mode=mode,
+            prune_cla_prefix=prune_cla_prefix,
         )
-    if cla_end < 0x00 or 0x100 < cla_end:
-        raise ValueError("Argument `cla_end` out of range. (0x00 <= cla_end <= 0x100)")
-    if ins_start < 0x00 or 0x100 < ins_start:
-        raise ValueError(
-            "Argument `ins_start` out of range. (0x00 <= ins_start <= 0x100)"
+    )
+
+
+@_validate_ranges(
+    validate=_validate_scan_options,
+    cla=(0x00, 0xFF),
+    ins=(0x00, 0xFF),
+    p1_start=(0x00, 0x100),
+    p1_end=(0x00, 0x100),
+    p2_start=(0x00, 0x100),
+    p2_end=(0x00, 0x100),
+)
+def iter_p1_p2(
+    connection: CardConnection,
+    cla: int,
+    ins: int,
+    p1_start: int = 0x00,
+    p1_end: int = 0x100,
+    p2_start: int = 0x00,
+    p2_end: int = 0x100,
+    concurrency: int = 1,
+    mode: ScanMode = "full",
+    always_probe_le_max: bool = False,
+) -> Iterator[tuple[int, int, CardResponseStatusType]]:
+    """Iterate valid P1-P2
+
+    Args:
+        connection (CardConnection): Card Connection
+        cla (int): CLA
+        ins (int): INS
+        p1_start (int, optional): P1 start. Defaults to 0x00.
+        p1_end (int, optional): P1 end. Defaults to 0x100.
+        p2_start (int, optional): P2 start. Defaults to 0x00.
+        p2_end (int, optional): P2 end. Defaults to 0x100.
+        concurrency (int, optional): Maximum APDUs in flight. APDUs only overlap on a CardConnection created with `thread_safe=True`. Defaults to 1.
+        mode (ScanMode, optional): "full" probes every P1. "adaptive" bisects the P1 range and drops sub-ranges whose sampled P1s are rejected at the first, middle and last P2. Hits at other P2 only in dropped P1s are missed. Defaults to "full".
+        always_probe_le_max (bool, optional): Retry rejected P1-P2 with Le=MAX even if Le=MAX at (`p1_start`, `p2_start`) is rejected with INS_NOT_PROVIDED or INCORRECT_LC_LE_FIELD. Defaults to False.
+
+    Raises:
+        ValueError: Invalid argument `cla`
+        ValueError: Invalid argument `ins`
+        ValueError: Invalid argument `p1_start`
+        ValueError: Invalid argument `p1_end`
+        ValueError: Invalid argument `p2_start`
+        ValueError: Invalid argument `p2_end`
+        ValueError: Invalid argument `concurrency`
+        ValueError: Invalid argument `mode`
+
+    Yields:
+        tuple[int, int, CardResponseStatusType]: Valid P1-P2 and Response Status
+    """
+
+    incorrect_p1_p2_value = CardResponseStatusType.INCORRECT_P1_P2_VALUE
+
+    # Only mutated here, so workers receive immutable bytes
+    command = CommandApdu(cla, ins, 0x00, 0x00, extended=connection.allow_extended_apdu)
+    le_max_field: bytes | None = command.lc_le_bytes(command.max_lc_le())
+
+    # Probe Le=MAX once and drop the retry for every P1-P2 if the CLA-INS rejects it
+    if not always_probe_le_max and p1_start < p1_end and p2_start < p2_end:
+        command.p1, command.p2 = p1_start, p2_start
+        status, data = connection.transmit(
+            command.to_bytes() + le_max_field, raise_error=False
         )
-    if ins_end < 0x00 or 0x100 < ins_end:
-        raise ValueError("Argument `ins_end` out of range. (0x00 <= ins_end <= 0x100)")
+        if status.status_type() in _LE_MAX_REJECTED_STATUS_TYPES:
+            le_max_field = None
 
-    cla_ins_list: list[tuple[int, int, CardResponseStatusType]] = []
-    for cla in tqdm(range(cla_start, cla_end), desc="List valid CLA-INS"):
-        for ins in range(ins_start, ins_end):
-            command = CommandApdu(
-                cla, ins, 0x00, 0x00, extended=connection.allow_extended_apdu
+    def commands(p1: int) -> Iterator[tuple[int, bytes, bytes | None]]:
+        for p2 in range(p2_start, p2_end):
+            command.p1, command.p2 = p1, p2
+            yield p2, command.to_bytes(), le_max_field
+
+    # A rejected P2 says nothing about the rest of the P1 row, so sample across it
+    sampled_p2s = sorted({p2_start, (p2_start + p2_end) // 2, p2_end - 1})
+
+    def is_incorrect_p1(p1: int) -> bool:
+        for p2 in sampled_p2s:
+            command.p1, command.p2 = p1, p2
+            p2, status, le_max = _probe_p1_p2(
+                connection, p2, command.to_bytes(), le_max_field
             )
-            status, data = connection.transmit(command, raise_error=False)
-            status_type = status.status_type()
-            if status_type == CardResponseStatusType.CLASS_NOT_PROVIDED:
-                break
-            if (
-                status_type == CardResponseStatusType.INS_NOT_PROVIDED
-                or status_type
-                == CardResponseStatusType.ACCESS_FEATURE_WITH_THE_SPECIFIED_LOGICAL_CHANNEL_NUMBER_NOT_PROVIDED
-                or status_type
-                == CardResponseStatusType.SECURE_MESSAGING_FEATURE_NOT_PROVIDED
-            ):
-                continue
-            cla_hex = format(cla, "02X")
-            ins_hex = format(ins, "02X")
-            sw_hex = format(status.sw, "04X")
-            tqdm.write(
-                f"CLA {cla_hex}, INS {ins_hex} found with status {sw_hex} ({status_type})."
+            if status.status_type() != incorrect_p1_p2_value:
+                return False
+        return True
+
+    if mode == "adaptive" and p2_start < p2_end:
+        p1s = _adaptive_rows(is_incorrect_p1, p1_start, p1_end)
+    else:
+        p1s = range(p1_start, p1_end)
+
+    with _BufferedWriter() as writer:
+        for p1 in tqdm(p1s, desc="List valid P1-P2"):
+            responses = _pipelined_map(
+                lambda item: _probe_p1_p2(connection, *item),
+                commands(p1),
+                concurrency,
             )
-            cla_ins_list.append((cla, ins, status))
-    return cla_ins_list
+            with closing(responses):
+                for p2, status, le_max in responses:
+                    status_type = status.status_type()
+                    if status_type == incorrect_p1_p2_value:
+                        continue
+                    p1_hex = format(p1, "02X")
+                    p2_hex = format(p2, "02X")
+                    le_text = "Le=MAX" if le_max else "No Le"
+                    sw_hex = format(status.sw, "04X")
+                    writer.write(
+                        f"P1 {p1_hex}, P2 {p2_hex}, {le_text} found with status {sw_hex} ({status_type})."
+                    )
+                    yield p1, p2, status
 
 
 def list_p1_p2(
@@ -97,6 +654,9 @@ def list_p1_p2(
     p1_end: int = 0x100,
     p2_start: int = 0x00,
     p2_end: int = 0x100,
+    concurrency: int = 1,
+    mode: ScanMode = "full",
+    always_probe_le_max: bool = False,
 ) -> list[tuple[int, int, CardResponseStatusType]]:
     """List valid P1-P2
 
@@ -108,6 +668,9 @@ def list_p1_p2(
         p1_end (int, optional): P1 end. Defaults to 0x100.
         p2_start (int, optional): P2 start. Defaults to 0x00.
         p2_end (int, optional): P2 end. Defaults to 0x100.
+        concurrency (int, optional): Maximum APDUs in flight. APDUs only overlap on a CardConnection created with `thread_safe=True`. Defaults to 1.
+        mode (ScanMode, optional): "full" probes every P1. "adaptive" bisects the P1 range and drops sub-ranges whose sampled P1s are rejected at the first, middle and last P2. Hits at other P2 only in dropped P1s are missed. Defaults to "full".
+        always_probe_le_max (bool, optional): Retry rejected P1-P2 with Le=MAX even if Le=MAX at (`p1_start`, `p2_start`) is rejected with INS_NOT_PROVIDED or INCORRECT_LC_LE_FIELD. Defaults to False.
 
     Raises:
         ValueError: Invalid argument `cla`
@@ -116,73 +679,212 @@ def list_p1_p2(
         ValueError: Invalid argument `p1_end`
         ValueError: Invalid argument `p2_start`
         ValueError: Invalid argument `p2_end`
+        ValueError: Invalid argument `concurrency`
+        ValueError: Invalid argument `mode`
 
     Returns:
         list[tuple[int, int, CardResponseStatusType]]: List of valid P1-P2 and Response Status
     """
 
-    if cla < 0x00 or 0xFF < cla:
-        raise ValueError("Argument `cla` out of range. (0x00 <= cla <= 0xFF)")
-    if ins < 0x00 or 0xFF < ins:
-        raise ValueError("Argument `ins` out of range. (0x00 <= ins <= 0xFF)")
-    if p1_start < 0x00 or 0x100 < p1_start:
-        raise ValueError(
-            "Argument `p1_start` out of range. (0x00 <= p1_start <= 0x100)"
+    return list(
+        iter_p1_p2(
+            connection,
+            cla,
+            ins,
+            p1_start,
+            p1_end,
+            p2_start,
+            p2_end,
+            concurrency=concurrency,
+            mode=mode,
+            always_probe_le_max=always_probe_le_max,
         )
-    if p1_end < 0x00 or 0x100 < p1_end:
-        raise ValueError("Argument `p1_end` out of range. (0x00 <= p1_end <= 0x100)")
-    if p2_start < 0x00 or 0x100 < p2_start:
-        raise ValueError(
-            "Argument `p2_start` out of range. (0x00 <= p2_start <= 0x100)"
+    )
+
+
+def _read_tlv(data: bytes, offset: int) -> tuple[int, bytes, int]:
+    """Read BER-TLV
+
+    Args:
+        data (bytes): Data
+        offset (int): Offset of the tag
+
+    Raises:
+        ValueError: Malformed TLV
+
+    Returns:
+        tuple[int, bytes, int]: Tag, Value and Offset of the next TLV
+    """
+
+    tag = data[offset]
+    offset += 1
+    if tag & 0x1F == 0x1F:
+        # Subsequent tag bytes
+        while True:
+            tag = tag << 8 | data[offset]
+            offset += 1
+            if data[offset - 1] & 0x80 == 0x00:
+                break
+    length = data[offset]
+    offset += 1
+    if length & 0x80 != 0x00:
+        length_size = length & 0x7F
+        length = int.from_bytes(data[offset : offset + length_size], byteorder="big")
+        offset += length_size
+    value = data[offset : offset + length]
+    if len(value) != length:
+        raise ValueError("TLV value is shorter than its length.")
+    return tag, value, offset + length
+
+
+def _file_descriptor(data: bytes) -> int | None:
+    """Get File Descriptor byte from SELECT FILE response
+
+    Args:
+        data (bytes): FCP, FCI or FMD template
+
+    Returns:
+        int | None: File Descriptor byte (tag 82), or None if absent or malformed
+    """
+
+    try:
+        tag, template, _ = _read_tlv(data, 0)
+        if tag not in (0x62, 0x64, 0x6F):
+            return None
+        offset = 0
+        while offset < len(template):
+            tag, value, offset = _read_tlv(template, offset)
+            if tag == 0x82 and len(value) != 0:
+                return value[0]
+    except IndexError:
+        return None
+    except ValueError:
+        return None
+    return None
+
+
+# EF Attributes which do not depend on the security state
+_CACHEABLE_EF_ATTRIBUTES = frozenset(
+    {
+        CardFileAttribute.WEF_TRANSPARENT,
+        CardFileAttribute.WEF_RECORD,
+    }
+)
+
+_attribute_ef_store_lock = Lock()
+
+
+def _attribute_ef_store_key(
+    connection: CardConnection, ef_id: bytes, cla: int
+) -> str | None:
+    """Get persistent `attribute_ef` cache key
+
+    Args:
+        connection (CardConnection): Card Connection
+        ef_id (bytes): EF identifier
+        cla (int): CLA
+
+    Returns:
+        str | None: Cache key, or None if the cache must not be persisted
+    """
+
+    # Results after a command which may change the security state are not valid in the next session
+    if connection.security_state_changed:
+        return None
+    card_id = connection.atr if connection.atr is not None else connection.identifier
+    if card_id is None:
+        return None
+    df_id = connection.selected_df if connection.selected_df is not None else b""
+    return ":".join(
+        (
+            card_id.hex().upper(),
+            df_id.hex().upper(),
+            format(cla, "02X"),
+            ef_id.hex().upper(),
         )
-    if p2_end < 0x00 or 0x100 < p2_end:
-        raise ValueError("Argument `p2_end` out of range. (0x00 <= p2_end <= 0x100)")
+    )
 
-    p1_p2_list: list[tuple[bytes, CardResponseStatusType]] = []
-    for p1 in tqdm(range(p1_start, p1_end), desc="List valid P1-P2"):
-        for p2 in range(p2_start, p2_end):
-            # No Le
-            command = CommandApdu(
-                cla, ins, p1, p2, extended=connection.allow_extended_apdu
-            )
-            status, data = connection.transmit(command, raise_error=False)
-            status_type = status.status_type()
-            if status_type != CardResponseStatusType.INCORRECT_P1_P2_VALUE:
-                p1_hex = format(p1, "02X")
-                p2_hex = format(p2, "02X")
-                sw_hex = format(status.sw, "04X")
-                tqdm.write(
-                    f"P1 {p1_hex}, P2 {p2_hex}, No Le found with status {sw_hex} ({status_type})."
-                )
-                p1_p2_list.append((p1, p2, status))
-                continue
-            # Le=MAX
-            command.le = "max"
-            status, data = connection.transmit(command, raise_error=False)
-            status_type = status.status_type()
-            if status_type != CardResponseStatusType.INCORRECT_P1_P2_VALUE:
-                p1_hex = format(p1, "02X")
-                p2_hex = format(p2, "02X")
-                sw_hex = format(status.sw, "04X")
-                tqdm.write(
-                    f"P1 {p1_hex}, P2 {p2_hex}, Le=MAX found with status {sw_hex} ({status_type})."
-                )
-                p1_p2_list.append((p1, p2, status))
-                continue
-    return p1_p2_list
+
+def _load_ef_attribute(
+    connection: CardConnection, ef_id: bytes, cla: int
+) -> CardFileAttribute | None:
+    """Load EF Attribute from cache
+
+    Args:
+        connection (CardConnection): Card Connection
+        ef_id (bytes): EF identifier
+        cla (int): CLA
+
+    Returns:
+        CardFileAttribute | None: EF Attribute, or None if not cached
+    """
+
+    value = connection.attribute_ef_cache.get((cla, ef_id))
+    if value is not None:
+        return CardFileAttribute(value)
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is None:
+        return None
+    key = _attribute_ef_store_key(connection, ef_id, cla)
+    if key is None:
+        return None
+    with _attribute_ef_store_lock:
+        os.makedirs(cache_dir, exist_ok=True)
+        with shelve.open(os.path.join(cache_dir, "attribute_ef")) as store:
+            value = store.get(key)
+    if value is None:
+        return None
+    connection.attribute_ef_cache[(cla, ef_id)] = value
+    return CardFileAttribute(value)
+
+
+def _store_ef_attribute(
+    connection: CardConnection,
+    ef_id: bytes,
+    cla: int,
+    ef_attribute: CardFileAttribute,
+) -> None:
+    """Store EF Attribute to cache
+
+    Args:
+        connection (CardConnection): Card Connection
+        ef_id (bytes): EF identifier
+        cla (int): CLA
+        ef_attribute (CardFileAttribute): EF Attribute
+    """
+
+    connection.attribute_ef_cache[(cla, ef_id)] = ef_attribute.value
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is None:
+        return
+    key = _attribute_ef_store_key(connection, ef_id, cla)
+    if key is None:
+        return
+    with _attribute_ef_store_lock:
+        os.makedirs(cache_dir, exist_ok=True)
+        with shelve.open(os.path.join(cache_dir, "attribute_ef")) as store:
+            store[key] = ef_attribute.value
 
 
 def attribute_ef(
     connection: CardConnection,
     ef_id: bytes,
     cla: int = 0x00,
+    use_cache: bool = True,
 ) -> CardFileAttribute:
     """Attribute EF
 
+    Working EF results (WEF_TRANSPARENT and WEF_RECORD) are cached on the connection
+    until a command which may change the selected DF or the security state is sent.
+    Set the `SC_TOOLS_CACHE_DIR` environment variable to persist them across runs
+    per card model (ATR or NFC identifier) and selected DF,
+    as long as no command which may change the security state was sent.
+
     Args:
         connection (CardConnection): Card Connection
         ef_id (bytes): EF identifier
         cla (int, optional): CLA. Defaults to 0x00.
+        use_cache (bool, optional): Use cached result if any. Defaults to True.
 
     Raises:
         ValueError: Invalid argument `ef_id`
@@ -197,20 +899,64 @@ def attribute_ef(
     if cla < 0x00 or 0xFF < cla:
         raise ValueError("Argument `cla` out of range. (0x00 <= cla <= 0xFF)")
 
-    status, data = connection.select_ef(ef_id, cla=cla)
+    if use_cache:
+        ef_attribute = _load_ef_attribute(connection, ef_id, cla)
+        if ef_attribute is not None:
+            return ef_attribute
+
+    ef_attribute = _probe_ef_attribute(connection, ef_id, cla)
+    if use_cache and ef_attribute in _CACHEABLE_EF_ATTRIBUTES:
+        _store_ef_attribute(connection, ef_id, cla, ef_attribute)
+    return ef_attribute
+
+
+def _probe_ef_attribute(
+    connection: CardConnection, ef_id: bytes, cla: int
+) -> CardFileAttribute:
+    """Probe EF Attribute
+
+    Args:
+        connection (CardConnection): Card Connection
+        ef_id (bytes): EF identifier
+        cla (int): CLA
+
+    Returns:
+        CardFileAttribute: EF Attribute
+    """
+
+    file_descriptor = None
+    selected = False
+    if not connection.select_fcp_unsupported:
+        status, data = connection.select_ef(ef_id, cla=cla, raise_error=False, fcp=True)
+        status_type = status.status_type()
+        if status_type == CardResponseStatusType.NORMAL_END:
+            file_descriptor = _file_descriptor(data)
+            selected = True
+        elif status_type in _SELECT_FCP_REJECTED_STATUS_TYPES:
+            connection.select_fcp_unsupported = True
+    # Other statuses such as 61XX on T=0 or 6982 concern this EF only, so fall back for it alone
+    if not selected:
+        status, data = connection.select_ef(ef_id, cla=cla)
 
     ef_attribute = CardFileAttribute.UNKNOWN
+    # Skip probes for instructions the card already rejected as not provided
+    unsupported_cla_ins = connection.unsupported_cla_ins
+    # Working EF (ISO/IEC 7816-4 file descriptor byte 0b00000xxx) holds no key
+    is_working_ef = file_descriptor is not None and file_descriptor & 0xB8 == 0x00
 
     # IEF/VERIFY_KEY
-    status, data = connection.verify(None, cla=cla, raise_error=False)
-    status_type = status.status_type()
-    if status_type == CardResponseStatusType.VERIFICATION_UNMATCHING:
-        ef_attribute = CardFileAttribute.IEF_VERIFY_KEY
-        if status.verification_remaining() is None:
-            ef_attribute |= CardFileAttribute.VERIFICATION_UNLIMITED
-        if status.verification_remaining() == 0:
-            ef_attribute |= CardFileAttribute.LOCKED
-        return ef_attribute
+    if not is_working_ef and (cla, 0x20) not in unsupported_cla_ins:
+        status, data = connection.verify(None, cla=cla, raise_error=False)
+        status_type = status.status_type()
+        if status_type in _NOT_PROVIDED_STATUS_TYPES:
+            unsupported_cla_ins.add((cla, 0x20))
+        if status_type == CardResponseStatusType.VERIFICATION_UNMATCHING:
+            ef_attribute = CardFileAttribute.IEF_VERIFY_KEY
+            if status.verification_remaining() is None:
+                ef_attribute |= CardFileAttribute.VERIFICATION_UNLIMITED
+            if status.verification_remaining() == 0:
+                ef_attribute |= CardFileAttribute.LOCKED
+            return ef_attribute
 
     # # IEF/INTERNAL_AUTHENTICATE_KEY
     # status, data = connection.internal_authenticate(
@@ -224,33 +970,42 @@ def attribute_ef(
     #     return ef_attribute
 
     # IEF/EXTERNAL_AUTHENTICATE_KEY
-    status, data = connection.external_authenticate(None, cla=cla, raise_error=False)
-    status_type = status.status_type()
-    if status_type == CardResponseStatusType.VERIFICATION_UNMATCHING:
-        ef_attribute = CardFileAttribute.IEF_EXTERNAL_AUTHENTICATE_KEY
-        if status.verification_remaining() is None:
-            ef_attribute |= CardFileAttribute.VERIFICATION_UNLIMITED
-        if status.verification_remaining() == 0:
-            ef_attribute |= CardFileAttribute.LOCKED
+    if not is_working_ef and (cla, 0x82) not in unsupported_cla_ins:
+        status, data = connection.external_authenticate(
+            None, cla=cla, raise_error=False
+        )
+        status_type = status.status_type()
+        if status_type in _NOT_PROVIDED_STATUS_TYPES:
+            unsupported_cla_ins.add((cla, 0x82))
+        if status_type == CardResponseStatusType.VERIFICATION_UNMATCHING:
+            ef_attribute = CardFileAttribute.IEF_EXTERNAL_AUTHENTICATE_KEY
+            if status.verification_remaining() is None:
+                ef_attribute |= CardFileAttribute.VERIFICATION_UNLIMITED
+            if status.verification_remaining() == 0:
+                ef_attribute |= CardFileAttribute.LOCKED
 
     # IEF/JPKI_SIGN_PRIVATE_KEY
-    status, data = connection.jpki_sign(
-        b"\x30\x31\x30\x0B\x06\x09\x60\x86\x48\x01\x65\x03\x04\x02\x01\x05\x00\x04\x20\xe3\xb0\xc4\x42\x98\xfc\x1c\x14\x9a\xfb\xf4\xc8\x99\x6f\xb9\x24\x27\xae\x41\xe4\x64\x9b\x93\x4c\xa4\x95\x99\x1b\x78\x52\xb8\x55",
-        raise_error=False,
-    )
-    status_type = status.status_type()
-    if status_type == CardResponseStatusType.NORMAL_END:
-        ef_attribute |= CardFileAttribute.JPKI_SIGN_PRIVATE_KEY
-    if status_type == CardResponseStatusType.SECURITY_STATUS_NOT_FULFILLED:
-        ef_attribute |= (
-            CardFileAttribute.JPKI_SIGN_PRIVATE_KEY
-            | CardFileAttribute.VERIFICATION_REQUIRED
+    if not is_working_ef and (0x80, 0x2A) not in unsupported_cla_ins:
+        status, data = connection.jpki_sign(
+            _JPKI_EMPTY_SHA256_DIGEST_INFO, raise_error=False
         )
+        status_type = status.status_type()
+        if status_type in _NOT_PROVIDED_STATUS_TYPES:
+            unsupported_cla_ins.add((0x80, 0x2A))
+        if status_type == CardResponseStatusType.NORMAL_END:
+            ef_attribute |= CardFileAttribute.JPKI_SIGN_PRIVATE_KEY
+        if status_type == CardResponseStatusType.SECURITY_STATUS_NOT_FULFILLED:
+            ef_attribute |= (
+                CardFileAttribute.JPKI_SIGN_PRIVATE_KEY
+                | CardFileAttribute.VERIFICATION_REQUIRED
+            )
 
     # IEF/EXTERNAL_AUTHENTICATE_KEY or IEF/JPKI_SIGN_PRIVATE_KEY
     if ef_attribute != CardFileAttribute.UNKNOWN:
         return ef_attribute
 
+    is_transparent = file_descriptor is not None and file_descriptor & 0x07 == 0x01
+
     # WEF/BINARY
     status, data = connection.read_binary(cla=cla, raise_error=False)
     status_type = status.status_type()
@@ -259,6 +1014,10 @@ def attribute_ef(
     if status_type == CardResponseStatusType.SECURITY_STATUS_NOT_FULFILLED:
         return CardFileAttribute.VERIFICATION_REQUIRED
 
+    # A transparent EF has no records
+    if is_transparent:
+        return CardFileAttribute.UNKNOWN
+
     # WEF/RECORD
     status, data = connection.read_record(cla=cla, raise_error=False)
     status_type = status.status_type()
@@ -270,12 +1029,113 @@ def attribute_ef(
     return CardFileAttribute.UNKNOWN
 
 
+@_validate_ranges(
+    validate=_validate_scan_options,
+    cla=(0x00, 0xFF),
+    start=(0x0000, 0x10000),
+    end=(0x0000, 0x10000),
+)
+def iter_ef(
+    connection: CardConnection,
+    cla: int = 0x00,
+    start: int = 0x0000,
+    end: int = 0x10000,
+    found_callback: Callable[[bytes, CardFileAttribute], None] | None = None,
+    concurrency: int = 1,
+    use_cache: bool = True,
+    connections: list[CardConnection] | None = None,
+) -> Iterator[tuple[bytes, CardFileAttribute]]:
+    """Iterate EF
+
+    Args:
+        connection (CardConnection): Card Connection
+        cla (int, optional): CLA. Defaults to 0x00.
+        start (int, optional): Start EF identifier. Defaults to 0x0000.
+        end (int, optional): End EF identifier. Defaults to 0x10000.
+        found_callback (Callable[[bytes, CardFileAttribute], None], optional): Found callback. Defaults to None.
+        concurrency (int, optional): Maximum SELECT FILE in flight. APDUs only overlap on a CardConnection created with `thread_safe=True`. Defaults to 1.
+        use_cache (bool, optional): Use cached EF Attribute if any. See `attribute_ef`. Defaults to True.
+        connections (list[CardConnection] | None, optional): Additional connections to cards of the same model, with the same DF selected. The EF range is split across `connection` and these, scanned in parallel, and `found_callback` is called from worker threads. EFs are yielded in the order they are found. Defaults to None.
+
+    Raises:
+        ValueError: Invalid argument `cla`
+        ValueError: Invalid argument `start`
+        ValueError: Invalid argument `end`
+        ValueError: Invalid argument `concurrency`
+        ValueError: Invalid argument `connections`
+        CardResponseError: Card returned error response
+
+    Yields:
+        tuple[bytes, CardFileAttribute]: EF identifier and EF Attribute
+    """
+
+    if connections is None:
+        yield from _iter_ef(
+            connection, cla, start, end, found_callback, concurrency, use_cache
+        )
+        return
+
+    shard_connections = [connection, *connections]
+    shard_size = max(-(-(end - start) // len(shard_connections)), 1)
+    # Each shard puts its EFs and then None when it is done
+    found: Queue[tuple[bytes, CardFileAttribute] | None] = Queue()
+    stopped = Event()
+
+    def scan_shard(
+        shard_connection: CardConnection, shard_start: int, position: int
+    ) -> None:
+        try:
+            shard = _iter_ef(
+                shard_connection,
+                cla,
+                shard_start,
+                min(shard_start + shard_size, end),
+                found_callback,
+                concurrency,
+                use_cache,
+                position,
+                stopped,
+            )
+            with closing(shard):
+                for ef in shard:
+                    found.put(ef)
+        except BaseException:
+            # Stop the other shards so that the error reaches the caller soon
+            stopped.set()
+            raise
+        finally:
+            found.put(None)
+
+    with ThreadPoolExecutor(max_workers=len(shard_connections)) as executor:
+        futures = [
+            executor.submit(scan_shard, shard_connection, shard_start, position)
+            for position, (shard_connection, shard_start) in enumerate(
+                zip(shard_connections, range(start, end, shard_size))
+            )
+        ]
+        try:
+            running = len(futures)
+            while running != 0:
+                ef = found.get()
+                if ef is None:
+                    running -= 1
+                    continue
+                yield ef
+        finally:
+            stopped.set()
+    for future in futures:
+        future.result()
+
+
 def list_ef(
     connection: CardConnection,
     cla: int = 0x00,
     start: int = 0x0000,
     end: int = 0x10000,
     found_callback: Callable[[bytes, CardFileAttribute], None] | None = None,
+    concurrency: int = 1,
+    use_cache: bool = True,
+    connections: list[CardConnection] | None = None,
 ) -> list[tuple[bytes, CardFileAttribute]]:
     """List EF
 
@@ -285,53 +1145,226 @@ def list_ef(
         start (int, optional): Start EF identifier. Defaults to 0x0000.
         end (int, optional): End EF identifier. Defaults to 0x10000.
         found_callback (Callable[[bytes, CardFileAttribute], None], optional): Found callback. Defaults to None.
+        concurrency (int, optional): Maximum SELECT FILE in flight. APDUs only overlap on a CardConnection created with `thread_safe=True`. Defaults to 1.
+        use_cache (bool, optional): Use cached EF Attribute if any. See `attribute_ef`. Defaults to True.
+        connections (list[CardConnection] | None, optional): Additional connections to cards of the same model, with the same DF selected. The EF range is split across `connection` and these, scanned in parallel, and `found_callback` is called from worker threads. Defaults to None.
 
     Raises:
         ValueError: Invalid argument `cla`
         ValueError: Invalid argument `start`
         ValueError: Invalid argument `end`
+        ValueError: Invalid argument `concurrency`
+        ValueError: Invalid argument `connections`
         CardResponseError: Card returned error response
 
     Returns:
-        list[tuple[bytes, CardFileAttribute]]: List of EF identifier and Response Status
+        list[tuple[bytes, CardFileAttribute]]: List of EF identifier and EF Attribute
     """
 
-    if cla < 0x00 or 0xFF < cla:
-        raise ValueError("Argument `cla` out of range. (0x00 <= cla <= 0xFF)")
-    if start < 0x00:
-        raise ValueError("Argument `start` must be greater than or equal 0x0000.")
-    if 0x10000 < start:
-        raise ValueError("Argument `start` must be less than or equal 0x10000.")
-    if end < 0x0000:
-        raise ValueError("Argument `end` must be greater than or equal 0x0000.")
-    if 0x10000 < end:
-        raise ValueError("Argument `end` must be less than or equal 0x10000.")
-
-    ef_list: list[tuple[bytes, CardFileAttribute]] = []
-    for ef_id in tqdm(range(start, end), desc="List EF"):
-        ef_id_bytes = ef_id.to_bytes(length=2, byteorder="big")
-        status, data = connection.select_ef(ef_id_bytes, cla=cla, raise_error=False)
-        status_type = status.status_type()
-        if (
-            status_type == CardResponseStatusType.NORMAL_END
-            or status_type == CardResponseStatusType.FILE_CONTROL_INFORMATION_FAILURE
-        ):
-            ef_attribute = attribute_ef(connection, ef_id_bytes, cla=cla)
-            tqdm.write(f"EF {ef_id_bytes.hex().upper()} ({ef_attribute.name}) found.")
-            ef_list.append((ef_id_bytes, ef_attribute))
-            if found_callback is not None:
-                found_callback(ef_id_bytes, ef_attribute)
-            continue
-        if status_type == CardResponseStatusType.NO_FILE_TO_BE_ACCESSED:
-            continue
-        raise CardResponseError(status)
+    ef_list = list(
+        iter_ef(
+            connection,
+            cla=cla,
+            start=start,
+            end=end,
+            found_callback=found_callback,
+            concurrency=concurrency,
+            use_cache=use_cache,
+            connections=connections,
+        )
+    )
+    if connections is not None:
+        # Shards are interleaved in the order they are found
+        ef_list.sort(key=lambda ef: ef[0])
     return ef_list
 
 
+def _iter_ef(
+    connection: CardConnection,
+    cla: int,
+    start: int,
+    end: int,
+    found_callback: Callable[[bytes, CardFileAttribute], None] | None,
+    concurrency: int,
+    use_cache: bool,
+    position: int | None = None,
+    stopped: Event | None = None,
+) -> Iterator[tuple[bytes, CardFileAttribute]]:
+    """Iterate EF on one connection
+
+    Args:
+        connection (CardConnection): Card Connection
+        cla (int): CLA
+        start (int): Start EF identifier
+        end (int): End EF identifier
+        found_callback (Callable[[bytes, CardFileAttribute], None] | None): Found callback
+        concurrency (int): Maximum SELECT FILE in flight
+        use_cache (bool): Use cached EF Attribute if any
+        position (int | None, optional): Progress bar position. Defaults to None.
+        stopped (Event | None, optional): Stop before the next SELECT FILE result once set. Defaults to None.
+
+    Raises:
+        CardResponseError: Card returned error response
+
+    Yields:
+        tuple[bytes, CardFileAttribute]: EF identifier and EF Attribute
+    """
+
+    def select_ef(ef_id_bytes: bytes) -> tuple[CardResponseStatus, bytes]:
+        return connection.select_ef(ef_id_bytes, cla=cla, raise_error=False)
+
+    executor = ThreadPoolExecutor(max_workers=concurrency) if concurrency > 1 else None
+
+    def submit(ef_id_bytes: bytes) -> Future[tuple[CardResponseStatus, bytes]]:
+        if executor is not None:
+            return executor.submit(select_ef, ef_id_bytes)
+        future: Future[tuple[CardResponseStatus, bytes]] = Future()
+        future.set_result(select_ef(ef_id_bytes))
+        return future
+
+    # Encode every EF identifier once, ahead of the SELECT FILE window
+    ef_ids = iter(
+        [ef_id.to_bytes(length=2, byteorder="big") for ef_id in range(start, end)]
+    )
+
+    ef_found_status_types = _EF_FOUND_STATUS_TYPES
+    no_file_to_be_accessed = CardResponseStatusType.NO_FILE_TO_BE_ACCESSED
+
+    pending: deque[tuple[bytes, Future[tuple[CardResponseStatus, bytes]]]] = deque()
+    try:
+        with (
+            _BufferedWriter() as writer,
+            tqdm(
+                total=max(end - start, 0),
+                desc="List EF",
+                position=position,
+                mininterval=_PROGRESS_MININTERVAL,
+                miniters=_PROGRESS_MINITERS,
+            ) as progress,
+        ):
+            for ef_id_bytes in islice(ef_ids, concurrency):
+                pending.append((ef_id_bytes, submit(ef_id_bytes)))
+            while len(pending) != 0:
+                if stopped is not None and stopped.is_set():
+                    return
+                ef_id_bytes, future = pending.popleft()
+                status, data = future.result()
+                progress.update()
+                status_type = status.status_type()
+                if status_type in ef_found_status_types:
+                    # SELECT FILE changes the current EF, so let SELECT FILE in flight finish first
+                    wait([in_flight for _, in_flight in pending])
+                    ef_attribute = attribute_ef(
+                        connection, ef_id_bytes, cla=cla, use_cache=use_cache
+                    )
+                    writer.write(
+                        f"EF {ef_id_bytes.hex().upper()} ({ef_attribute.name}) found."
+                    )
+                    if found_callback is not None:
+                        found_callback(ef_id_bytes, ef_attribute)
+                    yield ef_id_bytes, ef_attribute
+                elif status_type != no_file_to_be_accessed:
+                    raise CardResponseError(status)
+                next_ef_id_bytes = next(ef_ids, None)
+                if next_ef_id_bytes is not None:
+                    pending.append((next_ef_id_bytes, submit(next_ef_id_bytes)))
+    finally:
+        for _, future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown()
+
+
+@_validate_ranges(validate=_validate_scan_options, cla=(0x00, 0xFF))
+def iter_do(
+    connection: CardConnection,
+    cla: int = 0x00,
+    found_callback: Callable[[bytes, bool, bytes], None] | None = None,
+    concurrency: int = 1,
+) -> Iterator[tuple[bytes, bool]]:
+    """Iterate Data Object
+
+    Args:
+        connection (CardConnection): Card Connection
+        cla (int, optional): CLA. Defaults to 0x00.
+        found_callback (Callable[[bytes, bool, bytes], None], optional): Found callback. Defaults to None.
+        concurrency (int, optional): Maximum APDUs in flight. APDUs only overlap on a CardConnection created with `thread_safe=True`. Defaults to 1.
+
+    Raises:
+        ValueError: Invalid argument `cla`
+        ValueError: Invalid argument `concurrency`
+
+    Yields:
+        tuple[bytes, bool]: Tag and simplified encoding
+    """
+
+    one_byte_tags = [tag.to_bytes(length=1) for tag in range(0x01, 0xFF)]
+    two_byte_tags = [
+        tag.to_bytes(length=2, byteorder="big") for tag in range(0x1F1F, 0x10000)
+    ]
+
+    with _BufferedWriter() as writer:
+        # 1 byte tag, normal and simplified encoding
+        responses = _pipelined_map(
+            lambda tag: (
+                _probe_do(connection, tag, False, cla),
+                _probe_do(connection, tag, True, cla),
+            ),
+            tqdm(
+                one_byte_tags,
+                desc="List Data Object (1 byte tag)",
+                mininterval=_PROGRESS_MININTERVAL,
+                miniters=_PROGRESS_MINITERS,
+            ),
+            concurrency,
+        )
+        for normal_response, simplified_response in responses:
+            tag_bytes, status, data = normal_response
+            status_type = status.status_type()
+            if status_type in _DO_FOUND_STATUS_TYPES:
+                writer.write(
+                    f"Data Object {tag_bytes.hex().upper()} (1 byte tag) found."
+                )
+                if found_callback is not None:
+                    found_callback(tag_bytes, False, data)
+                yield tag_bytes, False
+            tag_bytes, status, data = simplified_response
+            status_type = status.status_type()
+            if status_type in _DO_FOUND_STATUS_TYPES:
+                writer.write(
+                    f"Data Object {tag_bytes.hex().upper()} (Simplified encoding) found."
+                )
+                if found_callback is not None:
+                    found_callback(tag_bytes, True, data)
+                yield tag_bytes, True
+
+        # 2 byte tag
+        responses = _pipelined_map(
+            lambda tag: _probe_do(connection, tag, False, cla),
+            tqdm(
+                two_byte_tags,
+                desc="List Data Object (2 byte tag)",
+                mininterval=_PROGRESS_MININTERVAL,
+                miniters=_PROGRESS_MINITERS,
+            ),
+            concurrency,
+        )
+        for tag_bytes, status, data in responses:
+            status_type = status.status_type()
+            if status_type in _DO_FOUND_STATUS_TYPES:
+                writer.write(
+                    f"Data Object {tag_bytes.hex().upper()} (2 byte tag) found."
+                )
+                if found_callback is not None:
+                    found_callback(tag_bytes, False, data)
+                yield tag_bytes, False
+
+
 def list_do(
     connection: CardConnection,
     cla: int = 0x00,
     found_callback: Callable[[bytes, bool, bytes], None] | None = None,
+    concurrency: int = 1,
 ) -> list[tuple[bytes, bool]]:
     """List Data Object
 
@@ -339,63 +1372,21 @@ def list_do(
         connection (CardConnection): Card Connection
         cla (int, optional): CLA. Defaults to 0x00.
         found_callback (Callable[[bytes, bool, bytes], None], optional): Found callback. Defaults to None.
+        concurrency (int, optional): Maximum APDUs in flight. APDUs only overlap on a CardConnection created with `thread_safe=True`. Defaults to 1.
 
     Raises:
         ValueError: Invalid argument `cla`
+        ValueError: Invalid argument `concurrency`
 
     Returns:
         list[tuple[bytes, bool]]: List of tag and simplified encoding
     """
 
-    if cla < 0x00 or 0xFF < cla:
-        raise ValueError("Argument `cla` out of range. (0x00 <= cla <= 0xFF)")
-
-    do_list: list[tuple[bytes, bool]] = []
-
-    # 1 byte tag
-    for tag in tqdm(range(0x01, 0xFF), desc="List Data Object (1 byte tag)"):
-        tag_bytes = tag.to_bytes(length=1)
-        status, data = connection.get_data(tag_bytes, cla=cla, raise_error=False)
-        status_type = status.status_type()
-        if (
-            status_type == CardResponseStatusType.NORMAL_END
-            or status_type == CardResponseStatusType.INCORRECT_LC_LE_FIELD
-        ):
-            tqdm.write(f"Data Object {tag_bytes.hex().upper()} (1 byte tag) found.")
-            do_list.append((tag_bytes, False))
-            if found_callback is not None:
-                found_callback(tag_bytes, False, data)
-
-    # Simplified encoding
-    for tag in tqdm(range(0x01, 0xFF), desc="List Data Object (Simplified encoding)"):
-        tag_bytes = tag.to_bytes(length=1)
-        status, data = connection.get_data(
-            tag_bytes, simplified_encoding=True, cla=cla, raise_error=False
+    return list(
+        iter_do(
+            connection,
+            cla=cla,
+            found_callback=found_callback,
+            concurrency=concurrency,
         )
-        status_type = status.status_type()
-        if (
-            status_type == CardResponseStatusType.NORMAL_END
-            or status_type == CardResponseStatusType.INCORRECT_LC_LE_FIELD
-        ):
-            tqdm.write(
-                f"Data Object {tag_bytes.hex().upper()} (Simplified encoding) found."
-            )
-            do_list.append((tag_bytes, True))
-            if found_callback is not None:
-                found_callback(tag_bytes, True, data)
-
-    # 2 byte tag
-    for tag in tqdm(range(0x1F1F, 0x10000), desc="List Data Object (2 byte tag)"):
-        tag_bytes = tag.to_bytes(length=2, byteorder="big")
-        status, data = connection.get_data(tag_bytes, cla=cla, raise_error=False)
-        status_type = status.status_type()
-        if (
-            status_type == CardResponseStatusType.NORMAL_END
-            or status_type == CardResponseStatusType.INCORRECT_LC_LE_FIELD
-        ):
-            tqdm.write(f"Data Object {tag_bytes.hex().upper()} (1 byte tag) found.")
-            do_list.append((tag_bytes, False))
-            if found_callback is not None:
-                found_callback(tag_bytes, False, data)
-
-    return do_list
+    )